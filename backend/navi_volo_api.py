@@ -1,215 +1,421 @@
 import aiohttp
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 import asyncio
+import gzip
 import logging
-from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
-from waitress import serve
+import orjson
+from numba import njit
+from datetime import datetime
+from quart import Quart, request
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
 import os
 import sys
+import time
 import traceback
-from jsonschema import validate, ValidationError
+from jsonschema import Draft7Validator, ValidationError
 
 # 設置日誌
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# 日誌級別由LOG_LEVEL環境變量控制，預設INFO；DEBUG日誌會序列化數據，只應用於排查問題
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").upper()
+_log_level = getattr(logging, LOG_LEVEL, None)
+logging.basicConfig(
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
 logger = logging.getLogger(__name__)
+# 無效嘅LOG_LEVEL唔應該令服務無法啟動，退回INFO
+if not isinstance(_log_level, int):
+    logger.warning("無效LOG_LEVEL: %s，改用INFO", LOG_LEVEL)
 
-# Flask應用
-app = Flask(__name__)
+# Quart應用（ASGI，異步路由直接喺服務器事件循環上運行）
+app = Quart(__name__)
+
+# JSON響應（orjson編碼，直接序列化NumPy數組）
+def json_response(payload, status=200):
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+    return app.response_class(body, status=status, mimetype="application/json")
+
+# 響應壓縮：客戶端支持gzip且JSON響應達到此大小先壓縮
+COMPRESS_MIN_SIZE = 500
+
+@app.after_request
+async def compress_response(response):
+    if (
+        response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+        or request.accept_encodings["gzip"] <= 0
+    ):
+        return response
+    body = await response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
 
 # Navi API端點
 POOLS_API = "https://open-api.naviprotocol.io/api/navi/pools"
 REWARDS_API = "https://open-api.naviprotocol.io/api/navi/user/rewards?userAddress={userAddress}"
 
+# 共用HTTP會話（連接池保持keep-alive，避免每次請求重新TCP/TLS握手）
+_session = None
+
+async def get_session():
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        logger.debug("已創建共用HTTP會話")
+    return _session
+
+@app.after_serving
+async def close_session():
+    if _session is not None and not _session.closed:
+        await _session.close()
+
 # 預測請求Schema
 predict_schema = {
     "type": "object",
     "properties": {
         "apr": {"type": "number"},
         "tvl": {"type": "number"},
-        "sui_price": {"type": "number"}
+        "sui_price": {"type": "number"},
+        # 可選：單筆預測嘅歷史平均APR基準，冇提供時由池數據計算
+        "avg_apr": {"type": "number"},
+        # 可選：提供歷史數據時用回歸模型預測
+        "historical": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "apr": {"type": "number"},
+                    "tvl": {"type": "number"},
+                    "sui_price": {"type": "number"}
+                },
+                "required": ["apr", "tvl", "sui_price"]
+            }
+        }
     },
     "required": ["apr", "tvl", "sui_price"]
 }
+# 預先編譯驗證器，避免每次請求重新處理Schema
+predict_validator = Draft7Validator(predict_schema)
+
+# 模擬歷史數據預設日數（池數據、模擬同預測共用）
+HISTORY_DAYS = 30
+
+# 模擬數據數值核心（Numba編譯，一次迴圈填滿三個數組）
+@njit(cache=True, fastmath=True)
+def _sim_core(days, base_apr, base_tvl, base_price):
+    apr = np.empty(days)
+    tvl = np.empty(days)
+    price = np.empty(days)
+    for i in range(days):
+        apr[i] = base_apr * (1 + 0.01 * (i % 5))
+        tvl[i] = base_tvl * (1 - 0.005 * (i % 7))
+        price[i] = base_price * (1 + 0.02 * (i % 3))
+    return apr, tvl, price
 
-# 模擬多日數據
-def simulate_historical_data(latest_data, days=30):
+# 導入時預先編譯，唔使第一個請求承擔JIT開銷
+_sim_core(1, 1.0, 1.0, 1.0)
+
+# 歷史數據時間戳：由base_time起每日倒推
+def _history_timestamps(base_time, days):
+    return np.datetime64(base_time) - np.arange(days).astype("timedelta64[D]")
+
+# 模擬多日數據（返回按列嘅NumPy數組，可直接交俾orjson序列化）
+def simulate_historical_data(latest_data, days=HISTORY_DAYS):
     try:
-        base_time = datetime.fromtimestamp(int(latest_data.get("lastUpdateTimestamp", str(int(datetime.now().timestamp() * 1000))) / 1000))
+        base_time = datetime.fromtimestamp(int(latest_data.get("lastUpdateTimestamp", str(int(datetime.now().timestamp() * 1000)))) / 1000)
         base_apr = float(latest_data.get("supplyIncentiveApyInfo", {}).get("apy", 4.908))
         base_tvl = float(latest_data.get("totalSupplyAmount", 52969686454591258)) / 1e9
         base_price = float(latest_data.get("oracle", {}).get("price", 4.34833514))
-        df = pd.DataFrame({
-            "timestamp": [base_time - timedelta(days=i) for i in range(days)],
-            "apr": [base_apr * (1 + 0.01 * (i % 5)) for i in range(days)],
-            "tvl": [base_tvl * (1 - 0.005 * (i % 7)) for i in range(days)],
-            "sui_price": [base_price * (1 + 0.02 * (i % 3)) for i in range(days)]
-        })
-        logger.debug(f"模擬歷史數據（前5筆）: {df.to_dict('records')[:5]}")
-        return df
+        apr, tvl, price = _sim_core(days, base_apr, base_tvl, base_price)
+        history = {
+            "timestamp": _history_timestamps(base_time, days),
+            "apr": apr,
+            "tvl": tvl,
+            "sui_price": price
+        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("模擬歷史數據（前5筆）: %s", {c: v[:5].tolist() for c, v in history.items()})
+        return history
     except Exception as e:
         logger.error(f"模擬數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
         return None
 
-# 獲取Volo質押池數據
-async def fetch_volo_data(pool_id="0x2::sui::SUI", days=30):
-    async with aiohttp.ClientSession() as session:
-        try:
-            logger.debug(f"請求Navi Pools API: {POOLS_API}")
-            async with session.get(POOLS_API, timeout=10) as response:
-                logger.debug(f"Navi Pools API響應狀態: {response.status}")
-                if response.status != 200:
-                    logger.error(f"獲取Pools API失敗: {response.status}")
-                    return {"error": f"無法獲取Navi Pools數據: HTTP {response.status}"}, 500
-                data = await response.json()
-                logger.debug(f"Navi Pools API原始數據（前2筆）: {data[:2]}")
-                for pool in data:
-                    if pool.get("coinType") == pool_id:
-                        df = simulate_historical_data(pool, days)
-                        if df is None:
-                            return {"error": "數據模擬失敗"}, 500
-                        logger.info(f"成功獲取SUI/vSUI池數據: APR={df['apr'][0]}%, TVL={df['tvl'][0]} SUI")
-                        return {
-                            "latest": {
-                                "apr": float(pool.get("supplyIncentiveApyInfo", {}).get("apy", 4.908)),
-                                "tvl": float(pool.get("totalSupplyAmount", 52969686454591258)) / 1e9,
-                                "sui_price": float(pool.get("oracle", {}).get("price", 4.34833514)),
-                                "timestamp": pool.get("lastUpdateTimestamp", str(int(datetime.now().timestamp() * 1000)))
-                            },
-                            "historical": df.to_dict('records')
-                        }, 200
+# 預設池數據（未找到SUI/vSUI池時使用；冇lastUpdateTimestamp，模擬時以當前時間為準）
+_DEFAULT_POOL = {
+    "supplyIncentiveApyInfo": {"apy": "4.908"},
+    "totalSupplyAmount": "52969686454591258",
+    "oracle": {"price": "4.34833514"}
+}
+_DEFAULT_LATEST = {
+    "apr": 4.908,
+    "tvl": 52969686454591258 / 1e9,
+    "sui_price": 4.34833514
+}
+# 預設池歷史數值列緩存：{days: {"apr": ..., "tvl": ..., "sui_price": ...}}（時間戳每次按當前時間重建）
+_default_history_cache = {}
+
+# 上游池數據TTL緩存：{pool_id: (過期時間, 池數據或None)}；include_history只影響輸出，共用同一份緩存
+POOLS_CACHE_TTL = 15.0
+_pool_cache = {}
+_pool_cache_locks = {}
+
+# 請求Pools API並按coinType搵出目標池（完整讀取響應，連接先可以返回連接池重用）
+async def _request_pool(session, pool_id):
+    async with session.get(POOLS_API) as response:
+        logger.debug("Navi Pools API響應狀態: %s", response.status)
+        if response.status != 200:
+            return None, response.status
+        data = await response.json(loads=orjson.loads)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Navi Pools API原始數據（前2筆）: %s", data[:2])
+        pools_by_coin = {p.get("coinType"): p for p in data}
+        return pools_by_coin.get(pool_id), 200
+
+# 獲取上游池數據（帶緩存，同一pool_id嘅並發請求只觸發一次上游調用；搵唔到池都會緩存）
+async def _get_pool(pool_id):
+    cached = _pool_cache.get(pool_id)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1], 200
+    lock = _pool_cache_locks.setdefault(pool_id, asyncio.Lock())
+    async with lock:
+        # 等鎖期間可能已經有其他請求更新咗緩存
+        cached = _pool_cache.get(pool_id)
+        if cached and time.monotonic() < cached[0]:
+            logger.debug("命中池數據緩存: %s", pool_id)
+            return cached[1], 200
+        session = await get_session()
+        logger.debug("請求Navi Pools API: %s", POOLS_API)
+        pool, status = await _request_pool(session, pool_id)
+        if status == 200:
+            _pool_cache[pool_id] = (time.monotonic() + POOLS_CACHE_TTL, pool)
+            if pool:
+                logger.info(f"成功獲取SUI/vSUI池數據: APR={pool.get('supplyIncentiveApyInfo', {}).get('apy')}%")
+            else:
                 logger.warning("未找到SUI/vSUI池，使用預設數據")
-                default_data = {
-                    "lastUpdateTimestamp": str(int(datetime.now().timestamp() * 1000)),
-                    "supplyIncentiveApyInfo": {"apy": "4.908"},
-                    "totalSupplyAmount": "52969686454591258",
-                    "oracle": {"price": "4.34833514"}
-                }
-                df = simulate_historical_data(default_data, days)
-                if df is None:
-                    return {"error": "預設數據模擬失敗"}, 500
-                logger.debug(f"預設池數據: {default_data}")
-                return {
-                    "latest": {
-                        "apr": 4.908,
-                        "tvl": 52969686454591258 / 1e9,
-                        "sui_price": 4.34833514,
-                        "timestamp": default_data["lastUpdateTimestamp"]
-                    },
-                    "historical": df.to_dict('records')
-                }, 200
-        except Exception as e:
-            logger.error(f"獲取數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
-            return {"error": f"獲取數據失敗: {str(e)}"}, 500
+        return pool, status
+
+# 獲取Volo質押池數據（latest同按需嘅歷史數據都由緩存嘅上游池數據構建）
+async def fetch_volo_data(pool_id="0x2::sui::SUI", days=HISTORY_DAYS, include_history=False):
+    try:
+        pool, status = await _get_pool(pool_id)
+        if status != 200:
+            logger.error(f"獲取Pools API失敗: {status}")
+            return {"error": f"無法獲取Navi Pools數據: HTTP {status}"}, 500
+        if pool:
+            latest = {
+                "apr": float(pool.get("supplyIncentiveApyInfo", {}).get("apy", 4.908)),
+                "tvl": float(pool.get("totalSupplyAmount", 52969686454591258)) / 1e9,
+                "sui_price": float(pool.get("oracle", {}).get("price", 4.34833514)),
+                "timestamp": pool.get("lastUpdateTimestamp", str(int(datetime.now().timestamp() * 1000)))
+            }
+            if not include_history:
+                # 唔需要歷史數據時唔使模擬
+                return {"latest": latest, "historical": {}}, 200
+            history = simulate_historical_data(pool, days)
+            if history is None:
+                return {"error": "數據模擬失敗"}, 500
+            return {"latest": latest, "historical": history}, 200
+        now = datetime.now()
+        default_latest = dict(_DEFAULT_LATEST, timestamp=str(int(now.timestamp() * 1000)))
+        if not include_history:
+            return {"latest": default_latest, "historical": {}}, 200
+        columns = _default_history_cache.get(days)
+        if columns is None:
+            # 預設池數值列只喺首次用到時模擬一次
+            history = simulate_historical_data(_DEFAULT_POOL, days)
+            if history is None:
+                return {"error": "預設數據模擬失敗"}, 500
+            columns = {c: v for c, v in history.items() if c != "timestamp"}
+            _default_history_cache[days] = columns
+        history = {"timestamp": _history_timestamps(now, days), **columns}
+        return {"latest": default_latest, "historical": history}, 200
+    except Exception as e:
+        logger.error(f"獲取數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
+        return {"error": f"獲取數據失敗: {str(e)}"}, 500
+
+# 獎勵記錄數達到此值先用pandas向量化過濾
+REWARDS_VECTORIZE_MIN = 50
+# NAVX獎勵嘅coin_type後綴
+_NAVX_SUFFIX = "::navx::NAVX"
+
+# 讀取獎勵字段：缺失或者null都用預設值（同向量化路徑嘅fillna一致）
+def _reward_field(reward, key, default):
+    value = reward.get(key)
+    return default if value is None else value
+
+# 向量化過濾獎勵（NAVX獎勵，指定池）
+def filter_rewards_vectorized(data, pool_id):
+    # dtype=object保持原始值類型，避免有缺失值時整數列被轉成float
+    df = pd.DataFrame(data, dtype=object).reindex(columns=["pool", "coin_type", "amount", "timestamp", "token_price"])
+    mask = (df["pool"] == pool_id) & df["coin_type"].fillna("").str.endswith(_NAVX_SUFFIX)
+    selected = df.loc[mask]
+    out = pd.DataFrame({
+        "amount": selected["amount"].astype(float).fillna(0) / 1e9,
+        "timestamp": selected["timestamp"].where(selected["timestamp"].notna(), ""),
+        "token_price": selected["token_price"].astype(float).fillna(0.144426003098488)
+    })
+    return out.to_dict("records")
 
 # 獲取用戶獎勵
 async def fetch_rewards(user_address, pool_id="0x96df0fce3c471489f4debaaa762cf960b3d97820bd1f3f025ff8190730e958c5"):
-    async with aiohttp.ClientSession() as session:
-        try:
-            logger.debug(f"請求Rewards API: {REWARDS_API.format(userAddress=user_address)}")
-            async with session.get(REWARDS_API.format(userAddress=user_address), timeout=10) as response:
-                logger.debug(f"Rewards API響應狀態: {response.status}")
-                if response.status != 200:
-                    logger.error(f"獲取Rewards API失敗: {response.status}")
-                    return [], 200
-                data = await response.json()
-                logger.debug(f"Rewards API原始數據（前2筆）: {data[:2]}")
+    try:
+        session = await get_session()
+        url = REWARDS_API.format(userAddress=user_address)
+        logger.debug("請求Rewards API: %s", url)
+        async with session.get(url) as response:
+            logger.debug("Rewards API響應狀態: %s", response.status)
+            if response.status != 200:
+                logger.error(f"獲取Rewards API失敗: {response.status}")
+                return [], 200
+            data = await response.json(loads=orjson.loads)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Rewards API原始數據（前2筆）: %s", data[:2])
+            if len(data) < REWARDS_VECTORIZE_MIN:
+                # 數據少時直接用列表推導，避免pandas開銷
                 rewards = [
                     {
-                        "amount": float(reward.get("amount", 0)) / 1e9,
-                        "timestamp": reward.get("timestamp", ""),
-                        "token_price": float(reward.get("token_price", 0.144426003098488))
+                        "amount": float(_reward_field(reward, "amount", 0)) / 1e9,
+                        "timestamp": _reward_field(reward, "timestamp", ""),
+                        "token_price": float(_reward_field(reward, "token_price", 0.144426003098488))
                     }
                     for reward in data
-                    if reward.get("pool", "") == pool_id and reward.get("coin_type", "").endswith("::navx::NAVX")
+                    if _reward_field(reward, "pool", "") == pool_id and _reward_field(reward, "coin_type", "").endswith(_NAVX_SUFFIX)
                 ]
-                logger.info(f"獲取獎勵: {len(rewards)}筆")
-                return rewards, 200
-        except Exception as e:
-            logger.error(f"獲取獎勵失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
-            return [], 200
-
-# AI預測最佳質押時機
-def predict_optimal_stake(df):
-    if df is None or len(df) < 5:
+            else:
+                rewards = filter_rewards_vectorized(data, pool_id)
+            logger.info(f"獲取獎勵: {len(rewards)}筆")
+            return rewards, 200
+    except Exception as e:
+        logger.error(f"獲取獎勵失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
+        return [], 200
+
+# AI預測最佳質押時機（數組按時間順序，最後一筆為最新數據）
+def _predict_from_arrays(apr_arr, tvl_arr, price_arr):
+    if len(apr_arr) < 5:
         logger.warning("數據不足，無法預測")
         return False
     try:
-        X = df[["sui_price", "tvl"]]
-        y = df["apr"]
-        model = LinearRegression().fit(X, y)
-        predicted_apr = model.predict(X[-1:])
-        avg_apr = df["apr"].mean()
-        logger.info(f"預測APR: {predicted_apr[0]:.2f}%，平均APR: {avg_apr:.2f}%")
-        return predicted_apr[0] > avg_apr * 1.1
+        # 最小二乘線性回歸：apr ~ sui_price + tvl
+        # 特徵先中心化（截距即係平均APR），避免TVL量級（~1e7）令設計矩陣病態
+        features = np.column_stack([price_arr, tvl_arr])
+        X = features - features.mean(axis=0)
+        y = np.asarray(apr_arr, dtype=float)
+        avg_apr = y.mean()
+        beta, *_ = np.linalg.lstsq(X, y - avg_apr, rcond=None)
+        predicted_apr = avg_apr + X[-1] @ beta
+        logger.info(f"預測APR: {predicted_apr:.2f}%，平均APR: {avg_apr:.2f}%")
+        return bool(predicted_apr > avg_apr * 1.1)
     except Exception as e:
         logger.error(f"預測失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
         return False
 
-# API端點：獲取池數據
+# 模擬歷史數據嘅平均APR：直接用_sim_core計APR列（TVL同價格唔需要，傳0）
+def _simulated_avg_apr(base_apr, days=HISTORY_DAYS):
+    return float(_sim_core(days, base_apr, 0.0, 0.0)[0].mean())
+
+# 單筆數據預測：毋須擬合模型，直接同歷史平均APR比較
+def _predict_scalar(apr, tvl, price, avg_apr):
+    return bool(apr > avg_apr * 1.1)
+
+# API端點：獲取池數據（?history=1先返回歷史數據）
 @app.route("/api/volo-data", methods=["GET"])
-def get_volo_data():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+async def get_volo_data():
+    include_history = request.args.get("history") == "1"
     try:
-        data, status = loop.run_until_complete(fetch_volo_data())
-        logger.debug(f"返回池數據: {data['latest'] if 'latest' in data else data}")
-        return jsonify(data), status
+        data, status = await fetch_volo_data(include_history=include_history)
+        logger.debug("返回池數據: %s", data.get("latest", data))
+        return json_response(data, status)
     except Exception as e:
         logger.error(f"處理池數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
-        return jsonify({"error": f"處理數據失敗: {str(e)}"}), 500
-    finally:
-        loop.close()
+        return json_response({"error": f"處理數據失敗: {str(e)}"}, 500)
 
 # API端點：獲取獎勵
 @app.route("/api/rewards", methods=["GET"])
-def get_rewards():
+async def get_rewards():
     user_address = request.args.get("user_address")
     if not user_address:
         logger.error("缺少user_address參數")
-        return jsonify({"error": "缺少user_address參數"}), 400
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+        return json_response({"error": "缺少user_address參數"}, 400)
     try:
-        rewards, status = loop.run_until_complete(fetch_rewards(user_address))
-        logger.debug(f"返回獎勵數據（前2筆）: {rewards[:2]}")
-        return jsonify(rewards), status
+        rewards, status = await fetch_rewards(user_address)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("返回獎勵數據（前2筆）: %s", rewards[:2])
+        return json_response(rewards, status)
     except Exception as e:
         logger.error(f"處理獎勵數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
-        return jsonify([]), 200
-    finally:
-        loop.close()
+        return json_response([], 200)
+
+# API端點：儀表板（池數據同用戶獎勵並發請求，共用同一個HTTP會話）
+@app.route("/api/dashboard", methods=["GET"])
+async def get_dashboard():
+    user_address = request.args.get("user_address")
+    include_history = request.args.get("history") == "1"
+    try:
+        if user_address:
+            (pool, status), (rewards, _) = await asyncio.gather(
+                fetch_volo_data(include_history=include_history),
+                fetch_rewards(user_address)
+            )
+        else:
+            (pool, status), rewards = await fetch_volo_data(include_history=include_history), []
+        logger.debug("返回儀表板數據: %s，獎勵%s筆", pool.get("latest", pool), len(rewards))
+        return json_response({"pool": pool, "rewards": rewards}, status)
+    except Exception as e:
+        logger.error(f"處理儀表板數據失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
+        return json_response({"error": f"處理數據失敗: {str(e)}"}, 500)
 
 # API端點：AI預測
 @app.route("/api/predict", methods=["POST"])
-def predict():
+async def predict():
     try:
-        data = request.get_json()
+        data = await request.get_json()
         if not data:
             raise ValidationError("無輸入數據")
-        validate(instance=data, schema=predict_schema)
-        df = pd.DataFrame([{
-            "apr": data["apr"],
-            "tvl": data["tvl"],
-            "sui_price": data["sui_price"]
-        }])
-        prediction = predict_optimal_stake(df)
-        logger.debug(f"AI預測結果: {prediction}")
-        return jsonify({"predict": prediction}), 200
+        predict_validator.validate(data)
+        if "historical" in data:
+            # 歷史數據加上最新一筆，用回歸模型預測
+            rows = data["historical"] + [data]
+            prediction = _predict_from_arrays(
+                np.array([row["apr"] for row in rows], dtype=float),
+                np.array([row["tvl"] for row in rows], dtype=float),
+                np.array([row["sui_price"] for row in rows], dtype=float)
+            )
+        else:
+            avg_apr = data.get("avg_apr")
+            if avg_apr is None:
+                # 冇提供基準時用緩存池數據計算；上游失敗唔可以當成「不建議質押」
+                pool, status = await fetch_volo_data()
+                if status != 200:
+                    logger.error("無法獲取池數據，無法預測")
+                    return json_response({"error": "無法獲取池數據，暫時無法預測"}, 503)
+                avg_apr = _simulated_avg_apr(pool["latest"]["apr"])
+            prediction = _predict_scalar(data["apr"], data["tvl"], data["sui_price"], avg_apr)
+        logger.debug("AI預測結果: %s", prediction)
+        return json_response({"predict": prediction}, 200)
     except ValidationError as e:
         logger.error(f"預測輸入無效: {str(e)} - 堆棧: {traceback.format_exc()}")
-        return jsonify({"error": "無效輸入數據"}), 400
+        return json_response({"error": "無效輸入數據"}, 400)
     except Exception as e:
         logger.error(f"預測失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
-        return jsonify({"error": f"預測失敗: {str(e)}"}), 500
+        return json_response({"error": f"預測失敗: {str(e)}"}, 500)
 
 # 啟動服務
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
     print(f"Server running on http://localhost:{port}")
+    config = Config()
+    config.bind = [f"0.0.0.0:{port}"]
     try:
-        serve(app, host="0.0.0.0", port=port)
+        asyncio.run(serve(app, config))
     except Exception as e:
         logger.error(f"服務器啟動失敗: {str(e)} - 堆棧: {traceback.format_exc()}")
         sys.exit(1)
\ No newline at end of file